@@ -9,6 +9,9 @@ Usage:
   alienware-lights wave                    Rainbow wave effect
   alienware-lights pulse RRGGBB            Pulsing single color
   alienware-lights off                     Turn all lights off
+  alienware-lights daemon                  Keep the devices open and serve
+                                           commands over a Unix socket
+  alienware-lights rebind                  Rebind the keyboard so it types again
 
   Targets (optional, default: all):
     --keyboard   Only keyboard
@@ -16,29 +19,91 @@ Usage:
     --ring       Only ring
     --logos      Only logos
 
+  Options:
+    --fast       Shorten the pauses between HID reports
+    --no-rebind  Leave the keyboard unbound (run "rebind" when done)
+
 Examples:
   alienware-lights static FF1493
   alienware-lights breathe FF0000 00FF00 0000FF
   alienware-lights spectrum --keyboard
   alienware-lights off
 """
-import os, fcntl, array, time, sys, subprocess, glob
+# subprocess, socket and signal are imported where they are used; most
+# invocations never need them
+import os, fcntl, time, sys, json, select, struct
+from functools import lru_cache
 
 HIDIOCSFEATURE = lambda l: 0xC0004806 | (l << 16)
 
+RAINBOW = ((0xFF, 0, 0), (0, 0xFF, 0), (0, 0, 0xFF))
+
+
+CACHE_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "alienware-lights", "hidraw.json")
+
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with open(CACHE_FILE, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+def _uevent_matches(name, vid, pid):
+    try:
+        fd = os.open("/sys/class/hidraw/" + name + "/device/uevent", os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        content = os.read(fd, 4096)
+    finally:
+        os.close(fd)
+    return vid.encode() in content and pid.encode() in content
+
 
+@lru_cache(maxsize=8)
 def find_hidraw(vid, pid):
-    for path in sorted(glob.glob("/sys/class/hidraw/hidraw*/device/uevent")):
-        with open(path) as f:
-            content = f.read()
-        if vid in content and pid in content:
-            return "/dev/" + path.split("/")[4]
+    # hidraw node numbers rarely change, so try the last known node first
+    key = vid + ":" + pid
+    cache = _load_cache()
+    name = cache.get(key)
+    if name and _uevent_matches(name, vid, pid):
+        return "/dev/" + name
+    try:
+        names = sorted(e.name for e in os.scandir("/sys/class/hidraw"))
+    except OSError:
+        return None
+    for name in names:
+        if _uevent_matches(name, vid, pid):
+            cache[key] = name
+            _save_cache(cache)
+            return "/dev/" + name
     return None
 
 
+def _pace(delay):
+    """Wait delay seconds between HID reports."""
+    select.select([], [], [], delay)
+
+
+@lru_cache(maxsize=256)
 def parse_color(s):
-    s = s.lstrip("#")
-    return int(s[0:2], 16), int(s[2:4], 16), int(s[4:6], 16)
+    h = s[1:] if s.startswith("#") else s
+    if len(h) != 6 or h.strip("0123456789abcdefABCDEF"):
+        raise ValueError(f"invalid color {s!r}, expected RRGGBB")
+    return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
 
 
 # ---------------------------------------------------------------------------
@@ -46,9 +111,22 @@ def parse_color(s):
 # ---------------------------------------------------------------------------
 
 class Keyboard:
-    def __init__(self):
+    REPORT_LEN = 64
+    # Created and watched by alienware-lights-rebind.path; its service
+    # rebinds as root and then empties the directory as the acknowledgement
+    REBIND_DIR = "/run/alienware-lights-rebind"
+    REBIND_ACK_TIMEOUT = 2.0
+
+    def __init__(self, fast=False):
         self.dev = find_hidraw("0D62", "BABC")
         self.fd = None
+        self.fast = fast
+        self._phys = None
+        self._last_effect = None
+        # Feature report buffer reused across sends; byte 0 is the report ID
+        self._buf = bytearray(self.REPORT_LEN)
+        self._buf[0] = 0xCC
+        self._used = 1
 
     def open(self):
         if not self.dev:
@@ -57,30 +135,40 @@ class Keyboard:
         self.fd = os.open(self.dev, os.O_RDWR | os.O_NONBLOCK)
         return True
 
-    def close(self):
+    def close(self, defer_rebind=False):
         if self.fd is not None:
             os.close(self.fd)
             self.fd = None
-        self._rebind()
+        if not defer_rebind:
+            self._rebind()
 
     def _send(self, data):
-        pkt = bytes([0xCC] + data + [0] * (64 - 1 - len(data)))
-        buf = array.array('B', pkt)
-        fcntl.ioctl(self.fd, HIDIOCSFEATURE(64), buf)
-
-    def _rebind(self):
-        if not self.dev:
-            return
+        n = 1 + len(data)
+        self._buf[1:n] = data
+        # Only bytes left over from a longer previous report need clearing
+        if n < self._used:
+            self._buf[n:self._used] = bytes(self._used - n)
+        self._used = n
+        fcntl.ioctl(self.fd, HIDIOCSFEATURE(self.REPORT_LEN), self._buf)
+
+    def _read_phys(self):
+        """USB interface the keyboard sits on, e.g. "1-3:1.0"."""
         uevent = "/sys/class/hidraw/" + self.dev.split("/")[-1] + "/device/uevent"
-        phys = None
         try:
             with open(uevent) as f:
                 for line in f:
                     if line.startswith("HID_PHYS="):
-                        phys = line.strip().split("=", 1)[1].split("/")[0]
-                        break
+                        return line.strip().split("=", 1)[1].split("/")[0]
         except FileNotFoundError:
+            pass
+        return None
+
+    def _rebind(self):
+        if not self.dev:
             return
+        if self._phys is None:
+            self._phys = self._read_phys()
+        phys = self._phys
         if phys:
             try:
                 with open("/sys/bus/usb/drivers/usbhid/unbind", "w") as f:
@@ -89,6 +177,9 @@ class Keyboard:
                 with open("/sys/bus/usb/drivers/usbhid/bind", "w") as f:
                     f.write(phys)
             except PermissionError:
+                if self._request_rebind():
+                    return
+                import subprocess
                 subprocess.run(
                     ["pkexec", "bash", "-c",
                      f'echo "{phys}" > /sys/bus/usb/drivers/usbhid/unbind; '
@@ -96,27 +187,67 @@ class Keyboard:
                      f'echo "{phys}" > /sys/bus/usb/drivers/usbhid/bind'],
                     check=False, capture_output=True)
 
+    def _request_rebind(self):
+        """Hand the rebind to the root path unit; False if it did not act.
+
+        The directory outlives a stopped or disabled watcher, so a write
+        alone proves nothing; only the request being removed counts.
+        """
+        request = os.path.join(self.REBIND_DIR, str(os.getpid()))
+        try:
+            with open(request, "w") as f:
+                f.write(self._phys + "\n")
+        except OSError:
+            return False
+        deadline = time.monotonic() + self.REBIND_ACK_TIMEOUT
+        while time.monotonic() < deadline:
+            if not os.path.exists(request):
+                return True
+            time.sleep(0.05)
+        try:
+            os.unlink(request)
+        except OSError:
+            pass
+        return False
+
     def _reset(self):
         self._send([0x94])
-        time.sleep(0.05)
+        # ioctl() blocks until the report is accepted; --fast skips the settle
+        if not self.fast:
+            _pace(0.05)
 
     def _commit(self):
         self._send([0x8b, 0x01, 0xFF])
 
     def _set_all_keys(self, r, g, b):
+        # Up to 15 (key, r, g, b) entries per report; only key IDs change
+        payload = bytearray(b"\x8c\x02\x00" + bytes((0, r, g, b)) * 15)
+        view = memoryview(payload)
+        delay = 0.001 if self.fast else 0.01
         for i in range(0, 0x88, 15):
-            keys = list(range(i, min(i + 15, 0x88)))
-            data = [0x8c, 0x02, 0x00]
-            for k in keys:
-                data += [k + 1, r, g, b]
-            self._send(data)
-            time.sleep(0.01)
+            n = min(15, 0x88 - i)
+            payload[3:3 + 4 * n:4] = range(i + 1, i + 1 + n)
+            self._send(view[:3 + 4 * n])
+            _pace(delay)
         self._send([0x8c, 0x13])
-        time.sleep(0.01)
+        _pace(delay)
 
     def _disable_effect(self):
         self._send([0x80, 0x01, 0xFE, 0x00, 0x00, 0x01, 0x01, 0x01])
-        time.sleep(0.05)
+        if not self.fast:
+            _pace(0.05)
+
+    def _ensure_ready(self, effect):
+        """Reset and disable the running effect when switching modes.
+
+        Repeated commands of the same kind in one process (an animation,
+        say) skip the prelude after the first.
+        """
+        if self._last_effect == effect:
+            return
+        self._reset()
+        self._disable_effect()
+        self._last_effect = effect
 
     def _global_effect(self, eff_type, tempo, colors):
         data = [0x80, eff_type, tempo, 0x00, 0x00, 0x01, 0x01, 0x01]
@@ -124,44 +255,36 @@ class Keyboard:
         for r, g, b in colors:
             data += [r, g, b]
         self._send(data)
-        time.sleep(0.05)
+        _pace(0.05)
 
     def static(self, r, g, b):
-        self._reset()
-        self._disable_effect()
+        self._ensure_ready("static")
         self._set_all_keys(r, g, b)
         self._commit()
 
     def breathe(self, colors):
-        self._reset()
-        self._disable_effect()
+        self._ensure_ready("breathe")
         self._global_effect(0x02, 0x07, colors)
         self._commit()
 
     def spectrum(self):
-        self._reset()
-        self._disable_effect()
+        self._ensure_ready("spectrum")
         # Spectrum = breathing through full rainbow
-        colors = [(0xFF, 0, 0), (0, 0xFF, 0), (0, 0, 0xFF)]
-        self._global_effect(0x02, 0x05, colors)
+        self._global_effect(0x02, 0x05, RAINBOW)
         self._commit()
 
     def wave(self):
-        self._reset()
-        self._disable_effect()
-        colors = [(0xFF, 0, 0), (0, 0xFF, 0), (0, 0, 0xFF)]
-        self._global_effect(0x03, 0x05, colors)
+        self._ensure_ready("wave")
+        self._global_effect(0x03, 0x05, RAINBOW)
         self._commit()
 
     def pulse(self, r, g, b):
-        self._reset()
-        self._disable_effect()
+        self._ensure_ready("pulse")
         self._global_effect(0x08, 0x07, [(r, g, b)])
         self._commit()
 
     def morph(self, colors):
-        self._reset()
-        self._disable_effect()
+        self._ensure_ready("morph")
         self._global_effect(0x02, 0x05, colors)
         self._commit()
 
@@ -173,20 +296,48 @@ class Keyboard:
 # Tron lights (AW-ELC, APIv4, output reports, no report ID)
 # ---------------------------------------------------------------------------
 
+def _elc_report(data):
+    pkt = bytearray(33)
+    pkt[0] = 0x03
+    pkt[1:1 + len(data)] = data
+    return bytes(pkt)
+
+
 class Tron:
     RING_ZONES = list(range(10, 20))
     LOGO_ZONES = [0, 1]
     POWER_STATES = [0x5b, 0x5c, 0x5d, 0x5e, 0x5f, 0x60]
 
+    # Fixed control reports
+    RING_CLEAR = _elc_report([0x21, 0x00, 0x04, 0x00, 0xFF])
+    RING_START = _elc_report([0x21, 0x00, 0x01, 0x00, 0xFF])
+    RING_PLAY = _elc_report([0x21, 0x00, 0x03, 0x00, 0xFF])
+    LOGO_PLAY = _elc_report([0x21, 0x00, 0x05, 0x00, 0xFF])
+    LOGO_REMOVE = {s: _elc_report([0x22, 0x00, 0x04, 0x00, s]) for s in POWER_STATES}
+    LOGO_START = {s: _elc_report([0x22, 0x00, 0x01, 0x00, s]) for s in POWER_STATES}
+    LOGO_SAVE = {s: _elc_report([0x22, 0x00, 0x02, 0x00, s]) for s in POWER_STATES}
+
     MORPH_EFFECT = 0x02
     COLOR_EFFECT = 0x00
     COLOR_MODE = 0xD0
     MORPH_MODE = 0xCF
     PULSE_MODE = 0xDC
 
-    def __init__(self):
+    # Zone selects for the default zones, and the per-color action headers
+    # that get spliced into an empty effect (0x24) report
+    RING_SELECT = _elc_report([0x23, 0x01, 0x00, len(RING_ZONES)] + RING_ZONES)
+    LOGO_SELECT = _elc_report([0x23, 0x01, 0x00, len(LOGO_ZONES)] + LOGO_ZONES)
+    EFFECT = _elc_report([0x24])
+    STATIC_STEP = bytes([COLOR_EFFECT, 0x07, COLOR_MODE, 0x00, 0xFA])
+    MORPH_STEP = bytes([MORPH_EFFECT, 0x07, MORPH_MODE, 0x00, 0x64])
+    PULSE_STEP = bytes([0x01, 0x07, PULSE_MODE, 0x00, 0x64])
+
+    def __init__(self, fast=False):
         self.dev = find_hidraw("187C", "0550")
         self.fd = None
+        self.fast = fast
+        # Another process may have left a user animation uncommitted
+        self._anim_pending = True
 
     def open(self):
         if not self.dev:
@@ -200,48 +351,77 @@ class Tron:
             os.close(self.fd)
             self.fd = None
 
-    def _send(self, data):
-        pkt = bytes([0x03] + data + [0] * (33 - 1 - len(data)))
-        os.write(self.fd, pkt)
-        time.sleep(0.02)
+    def _write(self, reports):
+        """Write prebuilt reports back to back, then pace.
 
-    def _set_ring(self, actions, zones=None):
+        hidraw has no vectored write handler, so the kernel hands each iovec
+        to the driver as its own report; fall back to os.write() for
+        whatever writev() did not get through.
+        """
+        done = 0
+        try:
+            done = os.writev(self.fd, reports) // 33
+        except OSError:
+            pass
+        for pkt in reports[done:]:
+            os.write(self.fd, pkt)
+        # hidraw always polls writable, so there is no readiness to wait
+        # for; --fast just uses the keyboard's shorter 1 ms gap
+        _pace(0.001 if self.fast else 0.02)
+
+    @staticmethod
+    def _select(zones):
+        return _elc_report([0x23, 0x01, 0x00, len(zones)] + zones)
+
+    def _set_ring(self, effect, zones=None):
         """Set ring with user animation (0x21)."""
-        if zones is None:
-            zones = self.RING_ZONES
-        self._send([0x21, 0x00, 0x04, 0x00, 0xFF])  # clear
-        self._send([0x21, 0x00, 0x01, 0x00, 0xFF])  # start new
-        self._send([0x23, 0x01, 0x00, len(zones)] + zones)  # select
-        self._send([0x24] + actions)  # effect
-        self._send([0x21, 0x00, 0x03, 0x00, 0xFF])  # play
-
-    def _set_logos(self, actions, zones=None):
+        select_zones = self.RING_SELECT if zones is None else self._select(zones)
+        self._write([
+            self.RING_CLEAR,
+            self.RING_START,
+            select_zones,
+            effect,
+            self.RING_PLAY,
+        ])
+        self._anim_pending = False
+
+    def _set_logos(self, effect, zones=None):
         """Set logos with power animation (0x22) across all power states."""
-        if zones is None:
-            zones = self.LOGO_ZONES
+        select_zones = self.LOGO_SELECT if zones is None else self._select(zones)
         # Commit any pending user animation first
-        self._send([0x21, 0x00, 0x03, 0x00, 0xFF])
-        time.sleep(0.05)
+        if self._anim_pending:
+            self._write([self.RING_PLAY])
+            _pace(0.05)
+            self._anim_pending = False
+        # One transaction per power state, paced between states only
         for state in self.POWER_STATES:
-            self._send([0x22, 0x00, 0x04, 0x00, state])  # remove
-            self._send([0x22, 0x00, 0x01, 0x00, state])  # start new
-            self._send([0x23, 0x01, 0x00, len(zones)] + zones)
-            self._send([0x24] + actions)
-            self._send([0x22, 0x00, 0x02, 0x00, state])  # save
-        self._send([0x21, 0x00, 0x05, 0x00, 0xFF])  # play
+            self._write([
+                self.LOGO_REMOVE[state],
+                self.LOGO_START[state],
+                select_zones,
+                effect,
+                self.LOGO_SAVE[state],
+            ])
+        self._write([self.LOGO_PLAY])
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _effect(step, colors):
+        """Build an effect report with one 8-byte action per color."""
+        pkt = bytearray(Tron.EFFECT)
+        for i, (r, g, b) in enumerate(colors):
+            struct.pack_into("5s3B", pkt, 2 + 8 * i, step, r, g, b)
+        return bytes(pkt)
 
     def _static_action(self, r, g, b):
-        return [self.COLOR_EFFECT, 0x07, self.COLOR_MODE, 0x00, 0xFA, r, g, b]
+        return self._effect(self.STATIC_STEP, ((r, g, b),))
 
     def _morph_actions(self, colors):
-        """Build morph action data for up to 3 colors."""
-        data = []
-        for r, g, b in colors[:3]:
-            data += [self.MORPH_EFFECT, 0x07, self.MORPH_MODE, 0x00, 0x64, r, g, b]
-        return data
+        """Build morph effect report for up to 3 colors."""
+        return self._effect(self.MORPH_STEP, tuple(colors[:3]))
 
     def _pulse_action(self, r, g, b):
-        return [0x01, 0x07, self.PULSE_MODE, 0x00, 0x64, r, g, b]
+        return self._effect(self.PULSE_STEP, ((r, g, b),))
 
     def static(self, r, g, b, ring=True, logos=True):
         action = self._static_action(r, g, b)
@@ -261,8 +441,7 @@ class Tron:
         self.breathe(colors, ring, logos)
 
     def spectrum(self, ring=True, logos=True):
-        colors = [(0xFF, 0, 0), (0, 0xFF, 0), (0, 0, 0xFF)]
-        self.breathe(colors, ring, logos)
+        self.breathe(RAINBOW, ring, logos)
 
     def pulse(self, r, g, b, ring=True, logos=True):
         action = self._pulse_action(r, g, b)
@@ -279,17 +458,26 @@ class Tron:
 # CLI
 # ---------------------------------------------------------------------------
 
-def main():
-    args = sys.argv[1:]
-    if not args or args[0] in ("-h", "--help"):
-        print(__doc__)
-        sys.exit(0)
+SOCKET_PATH = os.environ.get("ALIENWARE_LIGHTS_SOCKET", "/run/alienware-lights.sock")
+# How long the daemon holds the keyboard after the last command before
+# rebinding it so typing works again
+REBIND_IDLE = 1.0
+# A client gets this long to send its command before it is dropped
+CLIENT_TIMEOUT = 1.0
+# How long the CLI waits for the daemon's reply before running the command
+# itself; the slowest command, including a pending idle rebind, is well
+# under a second
+DAEMON_TIMEOUT = 2.0
+
 
+def _parse_args(args):
+    """Split argv into (cmd, color_args, keyboard, ring, logos, fast)."""
     # Parse target flags
     do_keyboard = "--keyboard" in args
     do_tron = "--tron" in args
     do_ring = "--ring" in args
     do_logos = "--logos" in args
+    fast = "--fast" in args
     args = [a for a in args if not a.startswith("--")]
 
     # Default: all targets
@@ -299,11 +487,264 @@ def main():
     do_ring_actual = do_tron or do_ring
     do_logos_actual = do_tron or do_logos
 
-    cmd = args[0].lower()
-    color_args = args[1:]
+    return args[0].lower(), args[1:], do_keyboard, do_ring_actual, do_logos_actual, fast
+
+
+# Command handlers: (color_args, kbd, tron, do_keyboard, do_ring, do_logos)
+# -> status line
+
+def _do_static(color_args, kbd, tron, do_keyboard, do_ring, do_logos):
+    r, g, b = parse_color(color_args[0]) if color_args else (0xFF, 0x14, 0x93)
+    if do_keyboard:
+        kbd.static(r, g, b)
+    if do_ring or do_logos:
+        tron.static(r, g, b, ring=do_ring, logos=do_logos)
+    return f"Static #{r:02X}{g:02X}{b:02X}"
+
+
+def _do_breathe(color_args, kbd, tron, do_keyboard, do_ring, do_logos):
+    colors = [parse_color(c) for c in color_args] if color_args else RAINBOW
+    if do_keyboard:
+        kbd.breathe(colors)
+    if do_ring or do_logos:
+        tron.breathe(colors, ring=do_ring, logos=do_logos)
+    return f"Breathing with {len(colors)} colors"
+
+
+def _do_morph(color_args, kbd, tron, do_keyboard, do_ring, do_logos):
+    colors = [parse_color(c) for c in color_args] if color_args else RAINBOW
+    if do_keyboard:
+        kbd.morph(colors)
+    if do_ring or do_logos:
+        tron.morph(colors, ring=do_ring, logos=do_logos)
+    return f"Morphing with {len(colors)} colors"
+
+
+def _do_spectrum(color_args, kbd, tron, do_keyboard, do_ring, do_logos):
+    if do_keyboard:
+        kbd.spectrum()
+    if do_ring or do_logos:
+        tron.spectrum(ring=do_ring, logos=do_logos)
+    return "Spectrum cycle"
+
+
+def _do_wave(color_args, kbd, tron, do_keyboard, do_ring, do_logos):
+    if do_keyboard:
+        kbd.wave()
+    if do_ring or do_logos:
+        tron.spectrum(ring=do_ring, logos=do_logos)
+    return "Rainbow wave"
+
+
+def _do_pulse(color_args, kbd, tron, do_keyboard, do_ring, do_logos):
+    r, g, b = parse_color(color_args[0]) if color_args else (0xFF, 0x14, 0x93)
+    if do_keyboard:
+        kbd.pulse(r, g, b)
+    if do_ring or do_logos:
+        tron.pulse(r, g, b, ring=do_ring, logos=do_logos)
+    return f"Pulsing #{r:02X}{g:02X}{b:02X}"
+
+
+def _do_off(color_args, kbd, tron, do_keyboard, do_ring, do_logos):
+    if do_keyboard:
+        kbd.off()
+    if do_ring or do_logos:
+        tron.off(ring=do_ring, logos=do_logos)
+    return "Lights off"
+
+
+HANDLERS = {
+    "static": _do_static,
+    "breathe": _do_breathe,
+    "morph": _do_morph,
+    "spectrum": _do_spectrum,
+    "wave": _do_wave,
+    "pulse": _do_pulse,
+    "off": _do_off,
+}
+
+
+def _send_to_daemon(args):
+    """Hand the command line to a running daemon.
+
+    Returns None if there is none or it does not answer within
+    DAEMON_TIMEOUT.
+    """
+    if not os.path.exists(SOCKET_PATH):
+        return None
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET) as s:
+            s.settimeout(DAEMON_TIMEOUT)
+            s.connect(SOCKET_PATH)
+            s.send(json.dumps(args).encode())
+            return json.loads(s.recv(65536))
+    except (OSError, ValueError):
+        return None
+
+
+def _reply(conn, reply):
+    # The client may already have gone away; that only costs it the reply
+    try:
+        conn.send(json.dumps(reply).encode())
+    except OSError:
+        pass
+
+
+def _reopen(cls, dev):
+    """Return dev, or a freshly opened cls instance (None if absent)."""
+    if dev is not None:
+        return dev
+    # A rebind, suspend or USB reset may have renumbered the hidraw node
+    find_hidraw.cache_clear()
+    dev = cls()
+    try:
+        return dev if dev.open() else None
+    except OSError as e:
+        # udev may not have (re)created the node yet; retry next command
+        print(f"Warning: opening {dev.dev} failed: {e}", file=sys.stderr)
+        return None
+
+
+def _close(dev):
+    """Close a daemon-held device; a failed close or rebind is only logged."""
+    try:
+        dev.close()
+    except OSError as e:
+        print(f"Warning: closing {dev.dev} failed: {e}", file=sys.stderr)
+
+
+def _serve(conn, kbd, tron, fast):
+    """Handle one client connection.
+
+    Returns the (possibly reopened) devices and whether the keyboard was
+    written to.
+    """
+    try:
+        args = json.loads(conn.recv(65536))
+        if not (isinstance(args, list) and all(isinstance(a, str) for a in args)):
+            raise ValueError("expected a list of strings")
+        cmd, color_args, do_keyboard, do_ring, do_logos, cmd_fast = _parse_args(args)
+    except (OSError, ValueError, IndexError):
+        # OSError covers a client that connects and never sends (timeout)
+        _reply(conn, {"status": 1, "output": "Malformed command"})
+        return kbd, tron, False
+
+    handler = HANDLERS.get(cmd)
+    if handler is None:
+        _reply(conn, {"status": 1, "output": f"Unknown command: {cmd}"})
+        return kbd, tron, False
+
+    if do_keyboard:
+        kbd = _reopen(Keyboard, kbd)
+    if do_ring or do_logos:
+        tron = _reopen(Tron, tron)
+    for dev in (kbd, tron):
+        if dev is not None:
+            dev.fast = fast or cmd_fast
+
+    used_kbd = do_keyboard and kbd is not None
+    try:
+        msg = handler(color_args, kbd, tron, used_kbd,
+                      tron is not None and do_ring, tron is not None and do_logos)
+    except ValueError as e:
+        reply = {"status": 1, "output": f"{cmd} failed: {e}"}
+    except OSError as e:
+        # Probably a stale fd; drop both devices so the next command
+        # reopens them
+        for dev in (kbd, tron):
+            if dev is not None:
+                _close(dev)
+        kbd = tron = None
+        reply = {"status": 1, "output": f"{cmd} failed: {e}"}
+    except Exception as e:
+        # One bad request must not take the daemon down with it
+        reply = {"status": 1, "output": f"{cmd} failed: {e!r}"}
+    else:
+        reply = {"status": 0, "output": msg}
+    _reply(conn, reply)
+    return kbd, tron, used_kbd
+
+
+def daemon(fast=False):
+    """Keep the devices open and take commands over SOCKET_PATH.
+
+    Devices are opened on first use and reopened after a failure. The
+    keyboard is closed and rebound once no keyboard command has arrived
+    for REBIND_IDLE seconds, so a burst of commands pays for one rebind.
+    """
+    import signal, socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        os.unlink(SOCKET_PATH)
+    except FileNotFoundError:
+        pass
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    sock.bind(SOCKET_PATH)
+    os.chmod(SOCKET_PATH, 0o666)
+    sock.listen(8)
+
+    kbd = tron = None
+    # Only keyboard commands push the rebind back; other traffic must not
+    # keep the keyboard unable to type
+    rebind_at = 0.0
+    try:
+        while True:
+            timeout = None
+            if kbd is not None:
+                timeout = max(0.0, rebind_at - time.monotonic())
+            if select.select([sock], [], [], timeout)[0]:
+                try:
+                    conn, _ = sock.accept()
+                except OSError:
+                    continue
+                with conn:
+                    conn.settimeout(CLIENT_TIMEOUT)
+                    kbd, tron, used_kbd = _serve(conn, kbd, tron, fast)
+                if used_kbd:
+                    rebind_at = time.monotonic() + REBIND_IDLE
+            if kbd is not None and time.monotonic() >= rebind_at:
+                _close(kbd)
+                kbd = None
+    finally:
+        for dev in (kbd, tron):
+            if dev is not None:
+                _close(dev)
+        sock.close()
+        os.unlink(SOCKET_PATH)
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] in ("-h", "--help"):
+        print(__doc__)
+        sys.exit(0)
+
+    if args[0] == "daemon":
+        daemon(fast="--fast" in args)
+        return
+    if args[0] == "rebind":
+        Keyboard()._rebind()
+        return
+
+    reply = _send_to_daemon(args)
+    if reply is not None:
+        if reply["status"]:
+            print(reply["output"], file=sys.stderr)
+            sys.exit(reply["status"])
+        print(reply["output"])
+        return
+
+    cmd, color_args, do_keyboard, do_ring_actual, do_logos_actual, fast = _parse_args(args)
+    no_rebind = "--no-rebind" in args
+    handler = HANDLERS.get(cmd)
+    if handler is None:
+        print(f"Unknown command: {cmd}", file=sys.stderr)
+        print(__doc__)
+        sys.exit(1)
 
-    kbd = Keyboard()
-    tron = Tron()
+    kbd = Keyboard(fast=fast)
+    tron = Tron(fast=fast)
 
     if do_keyboard:
         if not kbd.open():
@@ -313,67 +754,13 @@ def main():
             do_ring_actual = do_logos_actual = False
 
     try:
-        if cmd == "static":
-            r, g, b = parse_color(color_args[0]) if color_args else (0xFF, 0x14, 0x93)
-            if do_keyboard:
-                kbd.static(r, g, b)
-            if do_ring_actual or do_logos_actual:
-                tron.static(r, g, b, ring=do_ring_actual, logos=do_logos_actual)
-            print(f"Static #{r:02X}{g:02X}{b:02X}")
-
-        elif cmd == "breathe":
-            colors = [parse_color(c) for c in color_args] if color_args else [(0xFF, 0, 0), (0, 0xFF, 0), (0, 0, 0xFF)]
-            if do_keyboard:
-                kbd.breathe(colors)
-            if do_ring_actual or do_logos_actual:
-                tron.breathe(colors, ring=do_ring_actual, logos=do_logos_actual)
-            print(f"Breathing with {len(colors)} colors")
-
-        elif cmd == "morph":
-            colors = [parse_color(c) for c in color_args] if color_args else [(0xFF, 0, 0), (0, 0xFF, 0), (0, 0, 0xFF)]
-            if do_keyboard:
-                kbd.morph(colors)
-            if do_ring_actual or do_logos_actual:
-                tron.morph(colors, ring=do_ring_actual, logos=do_logos_actual)
-            print(f"Morphing with {len(colors)} colors")
-
-        elif cmd == "spectrum":
-            if do_keyboard:
-                kbd.spectrum()
-            if do_ring_actual or do_logos_actual:
-                tron.spectrum(ring=do_ring_actual, logos=do_logos_actual)
-            print("Spectrum cycle")
-
-        elif cmd == "wave":
-            if do_keyboard:
-                kbd.wave()
-            if do_ring_actual or do_logos_actual:
-                tron.spectrum(ring=do_ring_actual, logos=do_logos_actual)
-            print("Rainbow wave")
-
-        elif cmd == "pulse":
-            r, g, b = parse_color(color_args[0]) if color_args else (0xFF, 0x14, 0x93)
-            if do_keyboard:
-                kbd.pulse(r, g, b)
-            if do_ring_actual or do_logos_actual:
-                tron.pulse(r, g, b, ring=do_ring_actual, logos=do_logos_actual)
-            print(f"Pulsing #{r:02X}{g:02X}{b:02X}")
-
-        elif cmd == "off":
-            if do_keyboard:
-                kbd.off()
-            if do_ring_actual or do_logos_actual:
-                tron.off(ring=do_ring_actual, logos=do_logos_actual)
-            print("Lights off")
-
-        else:
-            print(f"Unknown command: {cmd}", file=sys.stderr)
-            print(__doc__)
-            sys.exit(1)
-
+        print(handler(color_args, kbd, tron, do_keyboard, do_ring_actual, do_logos_actual))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
     finally:
         if do_keyboard:
-            kbd.close()
+            kbd.close(defer_rebind=no_rebind)
         tron.close()
 
 